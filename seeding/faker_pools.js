@@ -0,0 +1,69 @@
+/**
+ * faker_pools.js
+ *
+ * Pre-generated pools of Faker strings for the seeder.
+ *
+ * Every Faker call walks its locale definitions, while the generated names only need a
+ * little entropy. The pools are filled once (at most POOL_SIZE calls per kind) and then
+ * sampled with the seeder's rng, so the number of Faker calls no longer grows with
+ * --products / --stores.
+ *
+ * Exports:
+ *  - buildFakerPools({ companies, colors, nouns, domains, slugs })
+ *  - pick(pool, rng = Math.random)
+ *  - productName(pools, rng = Math.random)
+ */
+
+import { faker } from '@faker-js/faker';
+
+const POOL_SIZE = 10000;
+
+/**
+ * @typedef {{companies: string[], colors: string[], nouns: string[], domains: string[], slugs: string[]}} FakerPools
+ */
+
+/**
+ * Fill one pool per kind of Faker value. Each pool holds as many values as are drawn from it,
+ * capped at POOL_SIZE, so a run never makes more Faker calls than drawing every value directly.
+ * @param {Object} sizes number of values drawn from each pool
+ * @param {number} sizes.companies
+ * @param {number} sizes.colors
+ * @param {number} sizes.nouns
+ * @param {number} sizes.domains
+ * @param {number} sizes.slugs
+ * @returns {FakerPools}
+ */
+export function buildFakerPools({ companies, colors, nouns, domains, slugs }) {
+  const fill = (size, gen) => Array.from({ length: Math.min(POOL_SIZE, size) }, gen);
+  return {
+    companies: fill(companies, () => faker.company.name()),
+    colors: fill(colors, () => faker.color.human()),
+    nouns: fill(nouns, () => faker.word.noun()),
+    domains: fill(domains, () => faker.internet.domainName()),
+    slugs: fill(slugs, () => faker.lorem.slug()),
+  };
+}
+
+/**
+ * Pick a random element of a pool.
+ * @param {string[]} pool
+ * @param {() => number} [rng=Math.random]
+ * @returns {string}
+ */
+export function pick(pool, rng = Math.random) {
+  return pool[Math.floor(rng() * pool.length)];
+}
+
+/**
+ * Build a single product name ("Company Color Noun", title-cased, max 64 chars).
+ * @param {FakerPools} pools
+ * @param {() => number} [rng=Math.random]
+ * @returns {string}
+ */
+export function productName(pools, rng = Math.random) {
+  return `${pick(pools.companies, rng)} ${pick(pools.colors, rng)} ${pick(pools.nouns, rng)}`
+    .replace(/\s+/g, ' ')
+    .trim()
+    .slice(0, 64)
+    .replace(/\b\w/g, (m) => m.toUpperCase());
+}
@@ -14,8 +14,8 @@
  *   PGHOST, PGPORT, PGDATABASE, PGUSER, PGPASSWORD
  *   MONGODB_URI, MONGODB_DB
  *
- * Requires: pg, mongodb, @faker-js/faker, uuid, yargs, seedrandom
- *   npm i pg mongodb @faker-js/faker uuid yargs seedrandom
+ * Requires: pg, pg-copy-streams, mongodb, @faker-js/faker, uuid, yargs, seedrandom
+ *   npm i pg pg-copy-streams mongodb @faker-js/faker uuid yargs seedrandom
  *
  * Usage examples:
  *   # Same behavior as before (MongoDB embedded only)
@@ -29,16 +29,20 @@
  */
 
 import process from 'node:process';
+import { Readable } from 'node:stream';
+import { pipeline } from 'node:stream/promises';
 import { fileURLToPath } from 'url';
 import yargs from 'yargs';
 import { hideBin } from 'yargs/helpers';
 import seedrandom from 'seedrandom';
 import { faker } from '@faker-js/faker';
-import { v7 as uuidv7 } from 'uuid';
+import { v7 as uuidv7, parse as uuidParse } from 'uuid';
 import pg from 'pg';
-import { MongoClient } from 'mongodb';
+import { from as copyFrom } from 'pg-copy-streams';
+import { MongoClient, MongoBulkWriteError } from 'mongodb';
 
 import { writeAllToCSVs, readAllFromCSVs } from './csv_writer.js'
+import { buildFakerPools, pick, productName } from './faker_pools.js';
 
 
 const ExecutionModes = Object.freeze({
@@ -79,12 +83,37 @@ const N_PRODUCTS = parseInt(process.env.N_PRODUCTS, 10) || DEFAULT_N_PRODUCTS;
 const N_OFFERS = parseInt(process.env.N_OFFERS, 10) || DEFAULT_N_OFFERS;
 
 // ---------- EAN-13 generation (valid checksum) ----------
-function ean13(rng = Math.random) {
-  const digits = Array.from({ length: 12 }, () => Math.floor(rng() * 10));
-  const sum_odd = digits.filter((_, i) => i % 2 === 0).reduce((a, b) => a + b, 0);
-  const sum_even = digits.filter((_, i) => i % 2 === 1).reduce((a, b) => a + b, 0);
-  const checksum = (10 - ((sum_odd + 3 * sum_even) % 10)) % 10;
-  return [...digits, checksum].join('');
+// Generates n unique EANs in one pass; digits and checksum are accumulated inline
+// instead of building and filtering a digit array per code.
+function ean13Batch(n, rng = Math.random) {
+  const eans = new Set();
+  while (eans.size < n) {
+    let code = '';
+    let sum_odd = 0;
+    let sum_even = 0;
+    for (let i = 0; i < 12; i++) {
+      const d = Math.floor(rng() * 10);
+      if (i % 2 === 0) sum_odd += d;
+      else sum_even += d;
+      code += d;
+    }
+    eans.add(code + ((10 - ((sum_odd + 3 * sum_even) % 10)) % 10));
+  }
+  return [...eans];
+}
+
+// ---------- Sampling ----------
+// Draws k distinct integers from [0, max) via a sparse partial Fisher-Yates shuffle:
+// only touched positions are stored, so time and memory are O(k) instead of O(max).
+function sampleIndices(max, k, rng = Math.random) {
+  const swapped = new Map();
+  const out = new Array(k);
+  for (let i = 0; i < k; i++) {
+    const j = i + Math.floor(rng() * (max - i));
+    out[i] = swapped.has(j) ? swapped.get(j) : j;
+    swapped.set(j, swapped.has(i) ? swapped.get(i) : i);
+  }
+  return out;
 }
 
 // ---------- Types (JSDoc) ----------
@@ -103,86 +132,141 @@ function generateData({ n_categories, n_products, n_stores, n_offers, rng = Math
     n_offers = 0;
   }
 
+  const pools = buildFakerPools({
+    companies: n_products + n_stores,
+    colors: n_products,
+    nouns: n_products + n_categories,
+    domains: n_stores,
+    slugs: n_stores,
+  });
+
   /** @type {Category[]} */
   const categories = [];
-  const usedCatNames = new Set();
-  while (categories.length < n_categories) {
-    const name = faker.word.noun().slice(0, 64).replace(/^[a-z]/, (m) => m.toUpperCase());
-    if (!usedCatNames.has(name)) {
-      categories.push({ id: uuidv7(), name });
-      usedCatNames.add(name);
-    }
+  // Names (and store names/urls below) carry their index, so they are unique by construction
+  for (let i = 0; i < n_categories; i++) {
+    const suffix = `_${i}`;
+    const name = pick(pools.nouns, rng).slice(0, 64 - suffix.length).replace(/^[a-z]/, (m) => m.toUpperCase()) + suffix;
+    categories.push({ id: uuidv7(), name });
   }
 
   /** @type {Product[]} */
   const products = [];
-  const usedEans = new Set();
+  const eans = ean13Batch(n_products, rng);
   for (let i = 0; i < n_products; i++) {
     const cat = categories.length ? categories[Math.floor(rng() * categories.length)] : null;
-    const pname = `${faker.company.name()} ${faker.color.human()} ${faker.word.noun()}`
-      .replace(/\s+/g, ' ')
-      .trim()
-      .slice(0, 64)
-      .replace(/\b\w/g, (m) => m.toUpperCase());
     const retail = Math.round((2.5 + rng() * (999.99 - 2.5)) * 100) / 100;
-    let e = ean13(rng);
-    while (usedEans.has(e)) e = ean13(rng);
-    usedEans.add(e);
     products.push({
       id: uuidv7(),
       category_id: cat ? cat.id : uuidv7(), // should not happen due to check above
-      ean: e,
-      name: pname,
+      ean: eans[i],
+      name: productName(pools, rng),
       retailPrice: Number(retail),
     });
   }
 
   /** @type {Store[]} */
   const stores = [];
-  const usedStoreNames = new Set();
-  const usedUrls = new Set();
-  while (stores.length < n_stores) {
-    const sname = `${faker.company.name()} Store`.slice(0, 64);
-    const url = `https://${faker.internet.domainName()}/${faker.lorem.slug()}`.slice(0, 128);
-    if (!usedStoreNames.has(sname) && !usedUrls.has(url)) {
-      stores.push({ id: uuidv7(), name: sname, url });
-      usedStoreNames.add(sname);
-      usedUrls.add(url);
-    }
+  for (let i = 0; i < n_stores; i++) {
+    const nameSuffix = ` Store ${i}`;
+    const urlSuffix = `-${i}`;
+    const sname = pick(pools.companies, rng).slice(0, 64 - nameSuffix.length) + nameSuffix;
+    const url = `https://${pick(pools.domains, rng)}/${pick(pools.slugs, rng)}`.slice(0, 128 - urlSuffix.length) + urlSuffix;
+    stores.push({ id: uuidv7(), name: sname, url });
   }
 
   /** @type {Offer[]} */
   const offers = [];
   if (n_offers > 0 && stores.length && products.length) {
-    const allPairs = [];
-    for (const s of stores) {
-      for (const p of products) {
-        allPairs.push([s.id, p.id, p.retailPrice]);
-      }
-    }
-    const max_possible = allPairs.length;
+    const max_possible = stores.length * products.length;
     if (n_offers > max_possible) {
       console.warn(`[WARN] Requested ${n_offers} offers, but only ${max_possible} unique (store, product) pairs exist. Capping to ${max_possible}.`);
       n_offers = max_possible;
     }
 
-    // Sample exactly n_offers unique pairs (Fisher-Yates partial shuffle)
-    for (let i = allPairs.length - 1; i > 0; i--) {
-      const j = Math.floor(rng() * (i + 1));
-      [allPairs[i], allPairs[j]] = [allPairs[j], allPairs[i]];
-    }
-    const sampled = allPairs.slice(0, n_offers);
-
-    for (const [store_id, product_id, basePrice] of sampled) {
-      const price = Math.round(basePrice * (0.6 + rng() * 0.6) * 100) / 100; // 0.6 - 1.2
+    // Sample exactly n_offers unique pair indices; idx -> (stores[idx / P], products[idx % P])
+    const n_prod = products.length;
+    // Prices are derived in integer cents and only turned back into euros when the offer is emitted
+    const baseCents = Int32Array.from(products, (p) => Math.round(p.retailPrice * 100));
+    for (const idx of sampleIndices(max_possible, n_offers, rng)) {
+      const s = stores[Math.floor(idx / n_prod)];
+      const pi = idx % n_prod;
+      const priceCents = Math.round(baseCents[pi] * (0.6 + rng() * 0.6)); // 0.6 - 1.2
       const amount = Math.floor(rng() * 251); // 0..250
-      offers.push({ store_id, product_id, price: Number(price), amount });
+      offers.push({ store_id: s.id, product_id: products[pi].id, price: priceCents / 100, amount });
     }
   }
 
   return { categories, products, stores, offers };
 }
 
+// ---------- Postgres COPY (text format) ----------
+const COPY_ESCAPES = { '\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r' };
+
+function copyText(value) {
+  return String(value).replace(/[\\\t\n\r]/g, (m) => COPY_ESCAPES[m]);
+}
+
+const COPY_CHUNK_ROWS = 10000;
+const COPY_MAX_PENDING_CHUNKS = 4;
+
+// Encodes rows lazily in COPY_CHUNK_ROWS chunks; the COPY stream pulls the next chunk
+// only once earlier ones were flushed, so at most a few chunks are held in memory.
+function* copyTextChunks(cols, rows) {
+  for (let start = 0; start < rows.length; start += COPY_CHUNK_ROWS) {
+    const end = Math.min(start + COPY_CHUNK_ROWS, rows.length);
+    let text = '';
+    for (let i = start; i < end; i++) {
+      text += cols.map((col) => copyText(rows[i][col])).join('\t') + '\n';
+    }
+    yield text;
+  }
+}
+
+// ---------- Postgres COPY (binary format, o_offers) ----------
+const COPY_BINARY_SIGNATURE = Buffer.from('PGCOPY\n\xff\r\n\0', 'latin1');
+const OFFER_ROW_BYTES = 2 + 2 * (4 + 16) + 2 * (4 + 4); // field count, 2x uuid, real, integer
+
+// Encodes (store_id uuid, product_id uuid, price real, amount integer) rows in COPY BINARY format,
+// so the server skips text parsing for the largest table. Chunked like copyTextChunks().
+// The 16-byte form of each store/product id is cached, so every id is parsed once, not once per offer.
+function* copyBinaryOfferChunks(offers) {
+  const uuidBytes = new Map();
+  const bytesOf = (id) => {
+    let b = uuidBytes.get(id);
+    if (!b) uuidBytes.set(id, (b = uuidParse(id)));
+    return b;
+  };
+
+  const header = Buffer.alloc(COPY_BINARY_SIGNATURE.length + 8); // flags + header extension length = 0
+  COPY_BINARY_SIGNATURE.copy(header);
+  yield header;
+
+  for (let start = 0; start < offers.length; start += COPY_CHUNK_ROWS) {
+    const end = Math.min(start + COPY_CHUNK_ROWS, offers.length);
+    const buf = Buffer.allocUnsafe((end - start) * OFFER_ROW_BYTES);
+    let pos = 0;
+    for (let i = start; i < end; i++) {
+      const o = offers[i];
+      pos = buf.writeInt16BE(4, pos);
+      pos = buf.writeInt32BE(16, pos);
+      buf.set(bytesOf(o.store_id), pos);
+      pos += 16;
+      pos = buf.writeInt32BE(16, pos);
+      buf.set(bytesOf(o.product_id), pos);
+      pos += 16;
+      pos = buf.writeInt32BE(4, pos);
+      pos = buf.writeFloatBE(o.price, pos);
+      pos = buf.writeInt32BE(4, pos);
+      pos = buf.writeInt32BE(o.amount, pos);
+    }
+    yield buf;
+  }
+
+  const trailer = Buffer.alloc(2);
+  trailer.writeInt16BE(-1);
+  yield trailer;
+}
+
 async function loadPostgres(categories, products, stores, offers) {
   const { Client } = pg;
   const client = new Client({
@@ -227,44 +311,54 @@ async function loadPostgres(categories, products, stores, offers) {
       primary key ("store_id", "product_id"));`,
   ];
 
+  // Unique constraints (default names from the inline `unique` above) that are re-validated after the COPY
+  const uniqueConstraints = [
+    ['pc_product_categories', 'pc_product_categories_name_key', 'name'],
+    ['p_products', 'p_products_ean_key', 'ean'],
+    ['s_stores', 's_stores_name_key', 'name'],
+    ['s_stores', 's_stores_url_key', 'url'],
+  ];
+
   try {
     await client.query('BEGIN');
+    // One-shot seed: no need to wait for the WAL flush at COMMIT
+    await client.query('SET LOCAL synchronous_commit = OFF');
     for (const sql of createSql) {
       await client.query(sql);
     }
     await client.query('TRUNCATE "o_offers", "p_products", "s_stores", "pc_product_categories" RESTART IDENTITY CASCADE;');
     console.log(`[Postgres] Cleanup done (tables truncated).`);
 
-    // Bulk inserts (batched to avoid Postgres 65,535-parameter limit)
-    const insertMany = async (table, cols, rows, conflictCols, maxParams = 60000) => {
+    // Drop the unique constraints for the load and re-add them afterwards: one sorted index build
+    // per constraint instead of a B-tree probe per copied row
+    for (const [table, constraint] of uniqueConstraints) {
+      await client.query(`alter table "${table}" drop constraint if exists "${constraint}"`);
+    }
+
+    // Bulk load via COPY ... FROM STDIN (one streamed command per table, FK order)
+    const copyChunks = async (sql, chunks) => {
+      const source = Readable.from(chunks, { highWaterMark: COPY_MAX_PENDING_CHUNKS });
+      await pipeline(source, client.query(copyFrom(sql)));
+    };
+    const copyRows = async (table, cols, rows) => {
       if (!rows.length) return;
-      const perRow = cols.length;
-      const rowsPerBatch = Math.max(1, Math.min(Math.floor(maxParams / perRow), 5000)); // safety cap
-      for (let start = 0; start < rows.length; start += rowsPerBatch) {
-        const chunk = rows.slice(start, start + rowsPerBatch);
-        const values = [];
-        const params = [];
-        let i = 1;
-        for (const row of chunk) {
-          const placeholders = [];
-          for (const col of cols) {
-            placeholders.push(`$${i++}`);
-            params.push(row[col]);
-          }
-          values.push(`(${placeholders.join(',')})`);
-        }
-        const conflict = conflictCols && conflictCols.length
-          ? ` on conflict (${conflictCols.map(e => `"${e}"`).join(', ')}) do nothing`
-          : '';
-        const sql = `insert into "${table}" (${cols.map(e => `"${e}"`).join(', ')}) values ${values.join(', ')}${conflict}`;
-        await client.query(sql, params);
-      }
+      const sql = `copy "${table}" (${cols.map(e => `"${e}"`).join(', ')}) from stdin`;
+      await copyChunks(sql, copyTextChunks(cols, rows));
     };
 
-    await insertMany('pc_product_categories', ['id', 'name'], categories, ['id']);
-    await insertMany('p_products', ['id', 'category_id', 'ean', 'name', 'retailPrice'], products, ['id']);
-    await insertMany('s_stores', ['id', 'name', 'url'], stores, ['id']);
-    await insertMany('o_offers', ['store_id', 'product_id', 'price', 'amount'], offers, ['store_id', 'product_id']);
+    await copyRows('pc_product_categories', ['id', 'name'], categories);
+    await copyRows('p_products', ['id', 'category_id', 'ean', 'name', 'retailPrice'], products);
+    await copyRows('s_stores', ['id', 'name', 'url'], stores);
+    if (offers.length) {
+      await copyChunks(
+        'copy "o_offers" ("store_id", "product_id", "price", "amount") from stdin with (format binary)',
+        copyBinaryOfferChunks(offers),
+      );
+    }
+
+    for (const [table, constraint, col] of uniqueConstraints) {
+      await client.query(`alter table "${table}" add constraint "${constraint}" unique ("${col}")`);
+    }
 
     const count = async (table) => (await client.query(`select count(*) from "${table}"`)).rows[0].count;
     const cat_count = await count('pc_product_categories');
@@ -282,6 +376,89 @@ async function loadPostgres(categories, products, stores, offers) {
   }
 }
 
+// ---------- MongoDB bulk insert (batched) ----------
+const MONGO_BATCH_SIZE = 100;
+const MONGO_MAX_PENDING_BATCHES = 4;
+
+// Inserts docs (any iterable) in MONGO_BATCH_SIZE chunks so no single insertMany runs into the
+// 16MB batch limit. Up to MONGO_MAX_PENDING_BATCHES inserts are in flight while the next batch
+// is being built. Returns the number of inserted documents, partial failures included; only
+// non-write errors (network, auth, ...) stop sending further batches and are rethrown.
+async function insertManyBatched(col, docs, tag, options = {}) {
+  let inserted = 0;
+  let failure = null;
+  const insertBatch = async (batch) => {
+    try {
+      const res = await col.insertMany(batch, { ordered: false, ...options });
+      inserted += Object.keys(res.insertedIds).length;
+    } catch (e) {
+      // Write errors (duplicates, schema validation, ...) only reject single documents: with ordered: false
+      // the rest of the batch is written and the remaining batches are still sent
+      if (e instanceof MongoBulkWriteError || (e && e.result)) {
+        console.warn(`[MongoDB][${tag}] Bulk insert warning:`, e.message);
+        inserted += e.insertedCount ?? e.result.insertedCount ?? 0;
+      } else {
+        failure = failure || e;
+      }
+    }
+  };
+
+  const pending = [];
+  let batch = [];
+  for (const doc of docs) {
+    batch.push(doc);
+    if (batch.length === MONGO_BATCH_SIZE) {
+      pending.push(insertBatch(batch));
+      batch = [];
+      if (pending.length === MONGO_MAX_PENDING_BATCHES) await pending.shift();
+      if (failure) break;
+    }
+  }
+  if (batch.length && !failure) pending.push(insertBatch(batch));
+  await Promise.all(pending);
+
+  if (failure) throw failure;
+  return inserted;
+}
+
+// Yields the embedded store documents one store at a time. The lookup maps and the offers grouped
+// by store are built up front from the fully materialized arrays; only the documents are lazy.
+// Adds the number of offers embedded in the built docs to stats.offers (expected, not confirmed inserted).
+function* embeddedStoreDocs(categories, products, stores, offers, stats = { offers: 0 }) {
+  const catById = new Map(categories.map((c) => [c.id, c.name]));
+  // One shared product subdocument per product; BSON serialization does not mutate nested objects
+  const productSubdoc = new Map(products.map((p) => [p.id, {
+    id: p.id,
+    category: catById.get(p.category_id) || 'Unknown',
+    ean: p.ean,
+    name: p.name,
+    product_id: Number(p.retailPrice),
+  }]));
+
+  const offersByStore = new Map();
+  for (const o of offers) {
+    const key = o.store_id;
+    if (!offersByStore.has(key)) offersByStore.set(key, []);
+    offersByStore.get(key).push(o);
+  }
+
+  for (const s of stores) {
+    const sOffers = offersByStore.get(s.id) || [];
+    const embeddedOffers = [];
+    for (const o of sOffers) {
+      const product = productSubdoc.get(o.product_id);
+      if (!product) continue;
+      embeddedOffers.push({
+        product,
+        price: Number(o.price),
+        amount: Number(o.amount),
+      });
+    }
+    stats.offers += embeddedOffers.length;
+    yield { id: s.id, name: s.name, url: s.url, offers: embeddedOffers };
+  }
+}
+
 // ---------- MongoDB (embedded) ----------
 async function loadMongoEmbedded(categories, products, stores, offers, useIndex) {
   let client;
@@ -307,6 +484,17 @@ async function loadMongoEmbedded(categories, products, stores, offers, useIndex)
     console.warn('[MongoDB][embedded] Cleanup warning:', e.message);
   }
 
+  const stats = { offers: 0 };
+  const docs = embeddedStoreDocs(categories, products, stores, offers, stats);
+
+  let inserted = 0;
+  try {
+    inserted = await insertManyBatched(colStore, docs, 'embedded', { bypassDocumentValidation: true });
+  } catch (e) {
+    console.error('[MongoDB][embedded] Error inserting stores:', e.message);
+  }
+
+  // Indexes are built after the bulk insert: one sorted pass instead of per-document B-tree checks
   if (useIndex === true) {
     try {
       await colStore.createIndex({ id: 1 }, { unique: true });
@@ -319,63 +507,12 @@ async function loadMongoEmbedded(categories, products, stores, offers, useIndex)
     }
   }
 
-  const catById = new Map(categories.map((c) => [c.id, c.name]));
-  const prodById = new Map(products.map((p) => [p.id, p]));
-
-  const offersByStore = new Map();
-  for (const o of offers) {
-    const key = o.store_id;
-    if (!offersByStore.has(key)) offersByStore.set(key, []);
-    offersByStore.get(key).push(o);
-  }
-
-  const docs = [];
-  for (const s of stores) {
-    const sOffers = offersByStore.get(s.id) || [];
-    const embeddedOffers = [];
-    for (const o of sOffers) {
-      const p = prodById.get(o.product_id);
-      if (!p) continue;
-      embeddedOffers.push({
-        product: {
-          id: p.id,
-          category: catById.get(p.category_id) || 'Unknown',
-          ean: p.ean,
-          name: p.name,
-          product_id: Number(p.retailPrice),
-        },
-        price: Number(o.price),
-        amount: Number(o.amount),
-      });
-    }
-    docs.push({ id: s.id, name: s.name, url: s.url, offers: embeddedOffers });
-  }
-
-  let inserted = 0;
-  try {
-    if (docs.length) {
-      const res = await colStore.insertMany(docs, { ordered: false });
-      inserted = Object.keys(res.insertedIds).length;
-    }
-  } catch (e) {
-    if (e && e.result && typeof e.result.nInserted === 'number') {
-      console.warn('[MongoDB][embedded] Bulk insert warning:', e.message);
-      inserted = e.result.nInserted;
-    } else {
-      console.error('[MongoDB][embedded] Error inserting stores:', e.message);
-    }
-  }
-
   try {
     const store_count = await colStore.countDocuments({});
-    const total_offers = await colStore.aggregate([
-      { $unwind: { path: '$offers', preserveNullAndEmptyArrays: false } },
-      { $count: 'n' },
-    ]).toArray().then((arr) => (arr[0] ? arr[0].n : 0));
-    console.log(`[MongoDB][embedded] Inserts — stores inserted:${inserted}`);
-    console.log(`[MongoDB][embedded] Docs now in DB — stores:${store_count} offers:${total_offers}`);
+    console.log(`[MongoDB][embedded] Inserts — stores inserted:${inserted} offers expected:${stats.offers}`);
+    console.log(`[MongoDB][embedded] Docs now in DB — stores:${store_count}`);
   } catch (e) {
-    console.error('[MongoDB][embedded] Count/Aggregation error:', e.message);
+    console.error('[MongoDB][embedded] Count error:', e.message);
   } finally {
     await client.close().catch(() => { });
   }
@@ -482,6 +619,17 @@ async function loadMongoEmbeddedWithSchema(categories, products, stores, offers)
   })
 
 
+  const stats = { offers: 0 };
+  const docs = embeddedStoreDocs(categories, products, stores, offers, stats);
+
+  let inserted = 0;
+  try {
+    inserted = await insertManyBatched(colStore, docs, 'schema');
+  } catch (e) {
+    console.error('[MongoDB][schema] Error inserting stores:', e.message);
+  }
+
+  // Indexes are built after the bulk insert: one sorted pass instead of per-document B-tree checks
   try {
     await colStore.createIndex({ id: 1 }, { unique: true });
     await colStore.createIndex({ name: 1 }, { unique: true });
@@ -492,64 +640,12 @@ async function loadMongoEmbeddedWithSchema(categories, products, stores, offers)
     console.warn('[MongoDB][schema] Index creation warning:', e.message);
   }
 
-
-  const catById = new Map(categories.map((c) => [c.id, c.name]));
-  const prodById = new Map(products.map((p) => [p.id, p]));
-
-  const offersByStore = new Map();
-  for (const o of offers) {
-    const key = o.store_id;
-    if (!offersByStore.has(key)) offersByStore.set(key, []);
-    offersByStore.get(key).push(o);
-  }
-
-  const docs = [];
-  for (const s of stores) {
-    const sOffers = offersByStore.get(s.id) || [];
-    const embeddedOffers = [];
-    for (const o of sOffers) {
-      const p = prodById.get(o.product_id);
-      if (!p) continue;
-      embeddedOffers.push({
-        product: {
-          id: p.id,
-          category: catById.get(p.category_id) || 'Unknown',
-          ean: p.ean,
-          name: p.name,
-          product_id: Number(p.retailPrice),
-        },
-        price: Number(o.price),
-        amount: Number(o.amount),
-      });
-    }
-    docs.push({ id: s.id, name: s.name, url: s.url, offers: embeddedOffers });
-  }
-
-  let inserted = 0;
-  try {
-    if (docs.length) {
-      const res = await colStore.insertMany(docs, { ordered: false });
-      inserted = Object.keys(res.insertedIds).length;
-    }
-  } catch (e) {
-    if (e && e.result && typeof e.result.nInserted === 'number') {
-      console.warn('[MongoDB][schema] Bulk insert warning:', e.message);
-      inserted = e.result.nInserted;
-    } else {
-      console.error('[MongoDB][schema] Error inserting stores:', e.message);
-    }
-  }
-
   try {
     const store_count = await colStore.countDocuments({});
-    const total_offers = await colStore.aggregate([
-      { $unwind: { path: '$offers', preserveNullAndEmptyArrays: false } },
-      { $count: 'n' },
-    ]).toArray().then((arr) => (arr[0] ? arr[0].n : 0));
-    console.log(`[MongoDB][schema] Inserts — stores inserted:${inserted}`);
-    console.log(`[MongoDB][schema] Docs now in DB — stores:${store_count} offers:${total_offers}`);
+    console.log(`[MongoDB][schema] Inserts — stores inserted:${inserted} offers expected:${stats.offers}`);
+    console.log(`[MongoDB][schema] Docs now in DB — stores:${store_count}`);
   } catch (e) {
-    console.error('[MongoDB][schema] Count/Aggregation error:', e.message);
+    console.error('[MongoDB][schema] Count error:', e.message);
   } finally {
     await client.close().catch(() => { });
   }
@@ -589,22 +685,6 @@ async function loadMongoReferencing(categories, products, stores, offers, useInd
     console.warn('[MongoDB][ref] Cleanup warning:', e.message);
   }
 
-  if (useIndex === true) {
-    try {
-      await colCat.createIndex({ name: 1 }, { unique: true });
-      await colProd.createIndex({ ean: 1 }, { unique: true });
-      await colProd.createIndex({ category_id: 1 }, { name: 'fk_category_id' });
-      await colStore.createIndex({ name: 1 }, { unique: true });
-      await colStore.createIndex({ url: 1 }, { product_id: true });
-
-      await colOffer.createIndex({ store_id: 1, product_id: 1 }, { unique: true, name: 'pk_store_product' });
-      await colOffer.createIndex({ store_id: 1 }, { name: 'fk_store_id' });
-      await colOffer.createIndex({ product_id: 1 }, { name: 'fk_product_id' });
-    } catch (e) {
-      console.warn('[MongoDB][ref] Index creation warning:', e.message);
-    }
-  }
-
   try {
     if (categories.length) {
       await colCat.insertMany(categories.map((c) => ({ _id: c.id, name: c.name })), { ordered: false });
@@ -638,7 +718,32 @@ async function loadMongoReferencing(categories, products, stores, offers, useInd
       if (offerDocs.length) await colOffer.insertMany(offerDocs, { ordered: false });
       if (skipped) console.log(`[MongoDB][ref] Skipped ${skipped} offers with missing references (should be 0).`);
     }
+  } catch (e) {
+    if (e && e.result) {
+      console.warn('[MongoDB][ref] Bulk insert warning:', e.message);
+    } else {
+      console.error('[MongoDB][ref] ERROR while inserting:', e.message);
+    }
+  }
+
+  // Indexes are built after the bulk insert: one sorted pass instead of per-document B-tree checks
+  if (useIndex === true) {
+    try {
+      await colCat.createIndex({ name: 1 }, { unique: true });
+      await colProd.createIndex({ ean: 1 }, { unique: true });
+      await colProd.createIndex({ category_id: 1 }, { name: 'fk_category_id' });
+      await colStore.createIndex({ name: 1 }, { unique: true });
+      await colStore.createIndex({ url: 1 }, { product_id: true });
+
+      await colOffer.createIndex({ store_id: 1, product_id: 1 }, { unique: true, name: 'pk_store_product' });
+      await colOffer.createIndex({ store_id: 1 }, { name: 'fk_store_id' });
+      await colOffer.createIndex({ product_id: 1 }, { name: 'fk_product_id' });
+    } catch (e) {
+      console.warn('[MongoDB][ref] Index creation warning:', e.message);
+    }
+  }
 
+  try {
     const [cat_count, prod_count, store_count, offer_count] = await Promise.all([
       colCat.countDocuments({}),
       colProd.countDocuments({}),
@@ -647,11 +752,7 @@ async function loadMongoReferencing(categories, products, stores, offers, useInd
     ]);
     console.log(`[MongoDB][ref] Docs now in DB — categories:${cat_count} products:${prod_count} stores:${store_count} offers:${offer_count}`);
   } catch (e) {
-    if (e && e.result) {
-      console.warn('[MongoDB][ref] Bulk insert warning:', e.message);
-    } else {
-      console.error('[MongoDB][ref] ERROR while inserting:', e.message);
-    }
+    console.error('[MongoDB][ref] Count error:', e.message);
   } finally {
     await client.close().catch(() => { });
   }
@@ -718,22 +819,43 @@ async function main() {
     let load_pg = false; // eben nicht
     let load_mongo = true; // eben schon
 
+    // Postgres and MongoDB are independent servers, so both loads run concurrently;
+    // allSettled lets one side finish (and log) even if the other one throws
+    const loads = [];
     if (load_pg) {
-      console.log('\n=== Loading into PostgreSQL ===');
-      await loadPostgres(categories, products, stores, offers);
+      loads.push({
+        name: 'Postgres',
+        run: (async () => {
+          console.log('\n=== Loading into PostgreSQL ===');
+          await loadPostgres(categories, products, stores, offers);
+        })(),
+      });
     }
 
     if (load_mongo) {
-      console.log('\n=== Loading into MongoDB (embedded model) ===');
-      await loadMongoEmbedded(categories, products, stores, offers, false);
-      await loadMongoEmbedded(categories, products, stores, offers, true);
-
-      await loadMongoEmbeddedWithSchema(categories, products, stores, offers);
-
-      console.log('\n=== Loading into MongoDB (referencing model) ===');
-      await loadMongoReferencing(categories, products, stores, offers, false);
-      await loadMongoReferencing(categories, products, stores, offers, true);
+      loads.push({
+        name: 'MongoDB',
+        run: (async () => {
+          console.log('\n=== Loading into MongoDB (embedded model) ===');
+          await loadMongoEmbedded(categories, products, stores, offers, false);
+          await loadMongoEmbedded(categories, products, stores, offers, true);
+
+          await loadMongoEmbeddedWithSchema(categories, products, stores, offers);
+
+          console.log('\n=== Loading into MongoDB (referencing model) ===');
+          await loadMongoReferencing(categories, products, stores, offers, false);
+          await loadMongoReferencing(categories, products, stores, offers, true);
+        })(),
+      });
     }
+
+    const results = await Promise.allSettled(loads.map((l) => l.run));
+    results.forEach((r, i) => {
+      if (r.status === 'rejected') {
+        console.error(`[${loads[i].name}] Load FAILED:`, r.reason && r.reason.message ? r.reason.message : r.reason);
+        process.exitCode = 1;
+      }
+    });
   }
 }
 